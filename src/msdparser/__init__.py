@@ -1,10 +1,10 @@
 """
-This top-level module re-exports :func:`.parse_msd`, :class:`.MSDParameter`,
-and :class:`.MSDParserError` for convenience.
+This top-level module re-exports :func:`.parse_msd`, :func:`.parse_msd_many`,
+:class:`.MSDParameter`, and :class:`.MSDParserError` for convenience.
 """
 
 __version__ = "3.0.0a6"
-__all__ = ["MSDParserError", "MSDParameter", "parse_msd"]
+__all__ = ["MSDParserError", "MSDParameter", "parse_msd", "parse_msd_many"]
 
-from .parser import MSDParserError, parse_msd
+from .parser import MSDParserError, parse_msd, parse_msd_many
 from .parameter import MSDParameter
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 import enum
-from io import StringIO
+from functools import partial
+from itertools import chain
 import re
-from typing import Iterator, List, Optional, TextIO, Tuple, cast
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple, cast
 
 
 __all__ = ["MSDToken", "lex_msd"]
@@ -34,13 +35,30 @@ class MSDToken(enum.Enum):
     """
 
 
+# Aliases for checking token types in tight loops. Loading a module global
+# is several times faster than looking up a member on the MSDToken class.
+_TEXT = MSDToken.TEXT
+_START_PARAMETER = MSDToken.START_PARAMETER
+_NEXT_COMPONENT = MSDToken.NEXT_COMPONENT
+_END_PARAMETER = MSDToken.END_PARAMETER
+_ESCAPE = MSDToken.ESCAPE
+_COMMENT = MSDToken.COMMENT
+
+# Tokens that always carry the same text, yielded without building a new tuple
+_START_PARAMETER_TOKEN = (_START_PARAMETER, "#")
+_NEXT_COMPONENT_TOKEN = (_NEXT_COMPONENT, ":")
+_SEMICOLON_TOKEN = (_END_PARAMETER, ";")
+
+
 class LexerMatch(enum.Enum):
-    ESCAPED_TEXT = re.compile(r"[^\\\/:;#]+")
-    UNESCAPED_TEXT = re.compile(r"[^\/:;#]+")
+    # A lone slash can't start a comment unless followed by another slash,
+    # so keep it in the surrounding text instead of splitting the text there
+    ESCAPED_TEXT = re.compile(r"(?:[^\\\/:;#]+|\/(?=[^\/]))+")
+    UNESCAPED_TEXT = re.compile(r"(?:[^\/:;#]+|\/(?=[^\/]))+")
     POUND = re.compile(r"#")
     COLON = re.compile(r":")
     SEMICOLON = re.compile(r";")
-    ESCAPE = re.compile(r"(?s)\\.")
+    ESCAPE = re.compile(r"(?s:\\.)")
     COMMENT = re.compile(r"//[^\r\n]*")
     SLASH = re.compile(r"/")
 
@@ -100,7 +118,37 @@ LEXER_PATTERNS = [
 ]
 
 
-SPACE_OR_TAB = re.compile(r"[ \t]*")
+def _combine_lexer_patterns(
+    escapes: bool,
+) -> Tuple[re.Pattern, Dict[Optional[str], Tuple[MSDToken, MSDToken]]]:
+    """
+    Join the lexer patterns that apply to the escapes flag into a single
+    regex, so that each token takes one match attempt instead of one per
+    pattern. Alternatives are tried in order, just like iterating over
+    :data:`LEXER_PATTERNS`.
+
+    Also returns a mapping from each group name to the pattern's
+    (outside parameter, inside parameter) tokens, so that indexing the
+    pair with the lexer's `inside_parameter` flag selects the token.
+    """
+    patterns = [
+        pattern for pattern in LEXER_PATTERNS if pattern.escapes in (None, escapes)
+    ]
+    regex = re.compile(
+        "|".join(
+            f"(?P<{pattern.match.name}>{pattern.match.value.pattern})"
+            for pattern in patterns
+        )
+    )
+    # Keyed by `Optional[str]` to match `re.Match.lastgroup`, so the
+    # lexer can look up tokens without a `typing.cast` call per token
+    return regex, {
+        pattern.match.name: (pattern.token_outside_param, pattern.token_inside_param)
+        for pattern in patterns
+    }
+
+
+LEXER_REGEXES = {escapes: _combine_lexer_patterns(escapes) for escapes in (True, False)}
 
 
 def lex_msd(
@@ -142,88 +190,81 @@ def lex_msd(
     if file is not None and string is not None:
         raise ValueError("must provide either a file or a string, not both")
 
-    textio = file if file else StringIO(string)
-
-    # Part of the MSD document that has been read but not consumed
+    # Part of the MSD document that has been read but not fully consumed
     msd_buffer = ""
 
+    # Index of the first unconsumed character in the MSD buffer. Advancing
+    # this cursor is cheaper than slicing consumed text off of the buffer
+    position = 0
+
     # Whether we are inside a parameter (between the '#' and its following ';')
     inside_parameter = False
 
-    # Whether we are done reading from the input file or string
-    done_reading = False
-
-    # Only the lexer patterns that match the escapes flag
-    # Pull out the regex pattern to reduce property accesses in the tight loop
-    lexer_patterns = cast(
-        List[Tuple[LexerPattern, re.Pattern]],
-        [
-            (pattern, pattern.match.value)
-            for pattern in LEXER_PATTERNS
-            if pattern.escapes in (None, escapes)
-        ],
+    # Combined regex for the lexer patterns that match the escapes flag
+    lexer_regex, lexer_tokens = LEXER_REGEXES[escapes]
+
+    # Chunks of the MSD document, each paired with whether it's the last one.
+    # A string is lexed in a single pass instead of being read in chunks
+    chunks: Iterable[Tuple[str, bool]] = (
+        chain(
+            ((chunk, False) for chunk in iter(partial(file.read, 65536), "")),
+            (("", True),),
+        )
+        if file is not None
+        else ((cast(str, string), True),)
     )
 
-    while not done_reading:
-        chunk = textio.read(4096)
-        if not chunk:
-            done_reading = True
-        msd_buffer += chunk
+    for chunk, done_reading in chunks:
+        msd_buffer = msd_buffer[position:] + chunk
+        position = 0
 
         # Reading chunks is faster than reading lines, but MSD relies on
         # lines to determine where comments end & when to recover from a
-        # missing semicolon. This condition enforces that the MSD buffer
-        # always either contains a newline *or* the rest of the input, so
-        # that comments, escapes, etc. don't get split in half.
-        while (
-            # Measurably faster than `any(c in msd_buffer for c in '\r\n')`
-            "\n" in msd_buffer
-            or "\r" in msd_buffer
-            or (done_reading and msd_buffer)
-        ):
-            for pattern, regex in lexer_patterns:
-                match = regex.match(msd_buffer)
-                if match:
-                    msd_buffer = msd_buffer[match.end() :]
-                    matched_text = match[0]
-                    token = (
-                        pattern.token_inside_param
-                        if inside_parameter
-                        else pattern.token_outside_param
-                    )
-
-                    # Recover from missing ';' at the end of a line
-                    if (
-                        # If we stopped at a '#' while parsing text inside a parameter,
-                        msd_buffer[:1] == "#"
-                        and inside_parameter
-                        and token is MSDToken.TEXT
-                        # And our text contains a newline (find the last one),
-                        and (
-                            last_nl := max(
-                                matched_text.rfind("\r"), matched_text.rfind("\n")
-                            )
-                        )
-                        != -1
-                        # And everything after that newline is ' ' or '\t'...
-                        and re.fullmatch(SPACE_OR_TAB, matched_text[last_nl + 1 :])
-                    ):
-                        # Stop the text at the trailing whitespace
-                        matched_text_before_ws = matched_text.rstrip("\r\n\t ")
-                        if matched_text_before_ws:
-                            yield (token, matched_text_before_ws)
-                        # Treat the trailing whitespace as an `END_PARAMETER` token
-                        token = MSDToken.END_PARAMETER
-                        matched_text = matched_text[len(matched_text_before_ws) :]
-
-                    if token is MSDToken.START_PARAMETER:
-                        inside_parameter = True
-                    elif token is MSDToken.END_PARAMETER:
-                        inside_parameter = False
+        # missing semicolon. Until we're done reading, only lex up to the
+        # last line break in the buffer, so that comments, escapes, etc.
+        # don't get split in half. The line break is found once per chunk
+        # rather than searching the buffer for every token.
+        if done_reading:
+            lex_until = len(msd_buffer)
+        else:
+            lex_until = max(msd_buffer.rfind("\n"), msd_buffer.rfind("\r")) + 1
 
-                    yield (token, matched_text)
-                    break
+        while position < lex_until:
+            match = lexer_regex.match(msd_buffer, position)
+            assert match, f"no regex matches {repr(msd_buffer[position:])}"
+            token = lexer_tokens[match.lastgroup][inside_parameter]
+            position = match.end()
+            matched_text = match[0]
+
+            # Recover from missing ';' at the end of a line
+            if (
+                # If we stopped at a '#' while parsing text inside a parameter,
+                # (cheapest checks first, since this runs for every token)
+                inside_parameter
+                and token is _TEXT
+                and msd_buffer.startswith("#", position)
+                # And our text ends with a newline, optionally followed by
+                # ' ' or '\t' (stripped from the end in a single pass)...
+                and matched_text.rstrip(" \t").endswith(("\r", "\n"))
+            ):
+                # Stop the text at the trailing whitespace
+                matched_text_before_ws = matched_text.rstrip("\r\n\t ")
+                if matched_text_before_ws:
+                    yield (token, matched_text_before_ws)
+                # Treat the trailing whitespace as an `END_PARAMETER` token
+                token = _END_PARAMETER
+                matched_text = matched_text[len(matched_text_before_ws) :]
 
+            if token is _START_PARAMETER:
+                inside_parameter = True
+                yield _START_PARAMETER_TOKEN
+            elif token is _NEXT_COMPONENT:
+                yield _NEXT_COMPONENT_TOKEN
+            elif token is _END_PARAMETER:
+                inside_parameter = False
+                if matched_text == ";":
+                    yield _SEMICOLON_TOKEN
+                else:
+                    yield (token, matched_text)
             else:
-                # Didn't break from the pattern iterator
-                assert False, f"no regex matches {repr(msd_buffer)}"
+                yield (token, matched_text)
@@ -1,6 +1,6 @@
+from collections import deque
 from dataclasses import dataclass
-from functools import reduce
-from io import StringIO
+from functools import lru_cache
 import re
 from typing import Mapping, Optional, Sequence, TextIO
 
@@ -8,16 +8,15 @@ from typing import Mapping, Optional, Sequence, TextIO
 __all__ = ["MSDParameter"]
 
 
+@lru_cache(maxsize=128)
 def match_next_n_lines(n: int) -> re.Pattern:
-    return re.compile(
-        r"^(?:[^\r\n]*(?:\r?\n)){NNN}[^\r\n]*".replace("NNN", str(n)), re.MULTILINE
-    )
+    return re.compile(r"(?:[^\r\n]*(?:\r?\n)){NNN}[^\r\n]*".replace("NNN", str(n)))
 
 
 UNTIL_NEWLINE = re.compile(r"([^\r\n]*)(\r?\n)", re.MULTILINE)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MSDParameter:
     """
     An MSD parameter, comprised of a key and some values (usually one).
@@ -26,8 +25,12 @@ class MSDParameter:
     any backslashes ``\\`` or special substrings.
     """
 
+    # The serialization methods below check for these substrings with
+    # hard-coded `in` checks; keep them in sync when editing these tuples
+    # (test_special_substrings_are_detected checks every entry)
     _MUST_ESCAPE = ("//", ":", ";")
     _SHOULD_ESCAPE = ("\\", "#")
+    _ESCAPE_REGEX = re.compile("|".join(map(re.escape, _SHOULD_ESCAPE + _MUST_ESCAPE)))
 
     components: Sequence[str]
     """The raw MSD components. Any special substrings are unescaped."""
@@ -108,74 +111,109 @@ class MSDParameter:
         substring, in which case a ``ValueError`` will be raised instead.
         """
         if escapes:
-            # Backslashes must be escaped first to avoid double-escaping
-            return reduce(
-                lambda key, esc: key.replace(esc, f"\\{esc}"),
-                MSDParameter._SHOULD_ESCAPE + MSDParameter._MUST_ESCAPE,
-                component,
-            )
-        elif any(esc in component for esc in MSDParameter._MUST_ESCAPE):
+            # Most components have nothing to escape; checking for that first
+            # is cheaper than a substitution that finds no matches. Substring
+            # checks are used over a regex search because they run at memchr
+            # speed, which matters for long components like note data.
+            if not (
+                "\\" in component
+                or "#" in component
+                or ":" in component
+                or ";" in component
+                or "/" in component
+            ):
+                return component
+            # Escape every special substring in one left-to-right pass,
+            # which never revisits (and double-escapes) inserted backslashes
+            return MSDParameter._ESCAPE_REGEX.sub(r"\\\g<0>", component)
+        elif ":" in component or ";" in component or "//" in component:
             raise ValueError(f"{repr(component)} can't be serialized without escapes")
         else:
             return component
 
-    def _serialize_components_exact(
-        self,
-        file: TextIO,
-        *,
-        escapes: bool = True,
-    ):
+    def _serialize_components_without_comments(self, *, escapes: bool = True) -> str:
+        # Fast path: join the components up front and check the result once.
+        # If the only special characters are the separators we just added,
+        # no component needs escaping, regardless of `escapes`.
+        joined = ":".join(self.components)
+        if not (
+            "\\" in joined
+            or "#" in joined
+            or ";" in joined
+            or "/" in joined
+            or joined.count(":") >= len(self.components)
+        ):
+            return joined
+
+        return ":".join(
+            MSDParameter._serialize_fragment_without_comments(
+                component, escapes=escapes
+            )
+            for component in self.components
+        )
+
+    def _serialize_components_exact(self, *, escapes: bool = True) -> str:
         if not escapes and self.escape_positions:
             raise ValueError(
                 "Can't serialize parameter containing escapes with exact=True and escapes=False"
             )
 
         comments: dict[int, str] = {ln: c for ln, c in self.comments or ()}
-        escape_positions = sorted(self.escape_positions or [])
+        escape_positions = deque(sorted(self.escape_positions or []))
 
         last_component = len(self.components) - 1
-        lines_with_comments = sorted(comments.keys())
+        lines_with_comments = deque(sorted(comments.keys()))
         line = 0
         # Account for the `#` already written
         position = 1
 
+        # Serialized text, joined once at the end
+        parts: list[str] = []
+
         def write_and_pop_escapes(fragment):
             nonlocal position
 
+            # Index of the first character in the fragment not yet written
+            start = 0
+
             while (
-                fragment
+                start < len(fragment)
                 and escape_positions
-                and position + len(fragment) > escape_positions[0]
+                and position + len(fragment) - start > escape_positions[0]
             ):
-                next_escape = escape_positions[0] - position
-                file.write(fragment[:next_escape])
-                file.write("\\")
-                fragment = fragment[next_escape:]
-                position = escape_positions.pop(0) + 1
+                next_escape = start + escape_positions[0] - position
+                parts.append(fragment[start:next_escape])
+                parts.append("\\")
+                start = next_escape
+                position = escape_positions.popleft() + 1
 
-            file.write(fragment)
-            position += len(fragment)
+            parts.append(fragment[start:])
+            position += len(fragment) - start
 
         for c, component in enumerate(self.components):
-            while component and lines_with_comments:
+            # Index of the first character in the component not yet written,
+            # tracked instead of slicing off written text after every match
+            offset = 0
+
+            while offset < len(component) and lines_with_comments:
                 line_with_comment = lines_with_comments[0]
                 assert line <= line_with_comment, f"{line} > {line_with_comment}"
                 if line == line_with_comment:
-                    match = re.match(UNTIL_NEWLINE, component)
+                    match = UNTIL_NEWLINE.match(component, offset)
                     if not match:
                         # No newline in the rest of this component;
                         # write it and move on to the next component
-                        write_and_pop_escapes(component)
-                        component = ""
+                        write_and_pop_escapes(component[offset:])
+                        offset = len(component)
                         break
                     # Insert comment before the newline
-                    component = component[len(match.group(0)) :]
+                    offset = match.end()
                     fragment: str = match.group(1)
                     newline: str = match.group(2)
                     write_and_pop_escapes(fragment)
                     write_and_pop_escapes(comments[line])
                     write_and_pop_escapes(newline)
-                    lines_with_comments.pop(0)
+                    lines_with_comments.popleft()
                     line += 1
 
                 else:
@@ -184,27 +222,27 @@ class MSDParameter:
                     assert lines_to_skip >= 1, f"{lines_to_skip} < 1"
 
                     next_n_lines = match_next_n_lines(lines_to_skip)
-                    match = re.match(next_n_lines, component)
+                    match = next_n_lines.match(component, offset)
                     if not match:
-                        write_and_pop_escapes(component)
-                        line += component.count("\n")
-                        component = ""
+                        write_and_pop_escapes(component[offset:])
+                        line += component.count("\n", offset)
+                        offset = len(component)
                         break
 
                     assert (
                         match.group(0).count("\n") == lines_to_skip
                     ), rf'{repr(match.group(0))}.count("\n") != {lines_to_skip}'
 
-                    component = component[len(match.group(0)) :]
+                    offset = match.end()
                     write_and_pop_escapes(match.group(0))
                     line += lines_to_skip
 
             # Handle any leftover component
-            if component:
-                write_and_pop_escapes(component)
+            if offset < len(component):
+                write_and_pop_escapes(component[offset:])
 
             if c != last_component:
-                file.write(":")
+                parts.append(":")
                 position += 1
 
         # We should have hit all the lines with comments by the end
@@ -212,6 +250,8 @@ class MSDParameter:
 
         assert not escape_positions, f"Unhandled escapes: {escape_positions}"
 
+        return "".join(parts)
+
     def serialize(
         self,
         file: TextIO,
@@ -228,30 +268,16 @@ class MSDParameter:
         interpolate the components unchanged, unless any contain a special
         substring, in which case a ``ValueError`` will be raised instead.
         """
-        if exact and self.preamble:
-            file.write(self.preamble)
-        file.write("#")
-        if exact and (self.comments or self.escape_positions):
-            self._serialize_components_exact(file, escapes=escapes)
-        else:
-            last_component = len(self.components) - 1
-            for c, component in enumerate(self.components):
-                file.write(
-                    MSDParameter._serialize_fragment_without_comments(
-                        component, escapes=escapes
-                    )
-                )
-                if c != last_component:
-                    file.write(":")
-        if exact:
-            file.write(self.suffix)
-        else:
-            file.write(";")
+        file.write(self.stringify(escapes=escapes, exact=exact))
 
     def __str__(self) -> str:
         return self.stringify()
 
     def stringify(self, *, escapes: bool = True, exact: bool = False):
-        output = StringIO()
-        self.serialize(output, escapes=escapes, exact=exact)
-        return output.getvalue()
+        if exact and (self.comments or self.escape_positions):
+            components = self._serialize_components_exact(escapes=escapes)
+        else:
+            components = self._serialize_components_without_comments(escapes=escapes)
+        if exact:
+            return f"{self.preamble or ''}#{components}{self.suffix}"
+        return f"#{components};"
@@ -1,11 +1,53 @@
-from io import StringIO
-from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
-
-from .lexer import lex_msd, MSDToken
+from functools import partial
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar, Union
+
+from .lexer import (
+    lex_msd,
+    MSDToken,
+    _TEXT,
+    _START_PARAMETER,
+    _NEXT_COMPONENT,
+    _END_PARAMETER,
+    _ESCAPE,
+    _COMMENT,
+)
 from .parameter import MSDParameter
 
 
-__all__ = ["MSDParserError", "parse_msd"]
+__all__ = ["MSDParserError", "parse_msd", "parse_msd_many"]
+
+
+_PathType = TypeVar("_PathType", bound=Union[str, os.PathLike])
+
+
+# Single characters that never count as stray text. Text between parameters
+# is usually a lone line break, so checking this set first lets us skip the
+# more general `str.isspace` scan in the common case.
+_WHITESPACE_OR_BOM = frozenset(" \t\r\n\ufeff")
+
+
+# Nearly every parameter ends with one of these suffixes. Returning a shared
+# copy of each avoids holding a separate string per parameter.
+_COMMON_SUFFIXES = {
+    suffix: suffix for suffix in (";", ";\n", ";\r\n", ";\n\n", ";\r\n\r\n", "\n")
+}
+
+
+def _join_fragments(fragments: List[str]) -> str:
+    # Most components are made of a single text fragment
+    if len(fragments) == 1:
+        return fragments[0]
+    return "".join(fragments)
+
+
+def _intern_key(key: str) -> str:
+    # Keys come from a small vocabulary (TITLE, BPMS, NOTES, ...), so sharing
+    # one string object per key saves memory across parameters and files
+    if len(key) <= 32 and key.isascii():
+        return sys.intern(key)
+    return key
 
 
 class MSDParserError(Exception):
@@ -43,20 +85,43 @@ def parse_msd(
     encountered between parameters, unless `ignore_stray_text` is True, in
     which case the stray text is simply discarded.
     """
-    if sum(param is None for param in (file, string, tokens)) != 2:
+    if (file is not None) + (string is not None) + (tokens is not None) != 1:
         raise TypeError(
             "Must provide exactly one of `file`, `string`, or `tokens` "
             "as a named argument"
         )
 
-    # Any text before the first parameter.
+    if tokens is None:
+        tokens = lex_msd(
+            file=file,
+            string=string,
+            escapes=escapes,
+        )
+
+    return _parse_tokens(tokens, escapes=escapes, strict=strict)
+
+
+def _parse_tokens(
+    tokens: Iterable[Tuple[MSDToken, str]],
+    *,
+    escapes: bool,
+    strict: bool,
+) -> Iterator[MSDParameter]:
+    """
+    Generator behind :func:`parse_msd`, kept separate so that arguments
+    are validated as soon as :func:`parse_msd` is called, rather than on
+    the first call to ``next``.
+    """
+    # Any text before the first parameter, as a list of text fragments.
     # After the first parameter, this is set to None and never used again.
-    preamble: Optional[StringIO] = StringIO()
+    preamble: Optional[List[str]] = []
 
-    # A partial MSD parameter
-    components: List[StringIO] = []
+    # A partial MSD parameter, as a list of text fragments per component
+    components: List[List[str]] = []
 
     # Whether we are inside a parameter (`#...;`)
+    # Only the token loop below reads or writes this flag, which keeps it a
+    # fast local variable instead of a closure cell
     inside_parameter: bool = False
 
     # Line number inside parameter (starting from the opening `#`)
@@ -65,148 +130,249 @@ def parse_msd(
     # Character index inside parameter (starting from the opening `#`)
     char_inside_parameter: int = 0
 
-    # Mapping of line numbers to comments (there can only be one per line)
-    comments: dict[int, str] = {}
+    # (line number, comment) pairs in line order; a list suffices where a
+    # dict would cost more to allocate for every parameter. Lines are only
+    # counted at '\n', so a '\r'-only line break can put a second comment
+    # on the same line number, in which case the last one wins
+    comments: list[tuple[int, str]] = []
 
     # Indices of escape sequences in the raw parameter
     # (including preceding escapes & comments)
     escape_positions: list[int] = []
 
-    # Any text after a parameter and before the next parameter
-    suffix = StringIO()
+    # Any text after a parameter and before the next parameter, as a list
+    # of text fragments
+    suffix: List[str] = []
 
-    # The last parameter we've seen (useful for debugging stray text)
+    # The last parameter we've seen (useful for debugging stray text).
+    # Only tracked during strict parsing, the only time it gets reported
     last_key: Optional[str] = None
 
-    def push_text(text: str) -> None:
+    def push_component_text(text: str) -> None:
+        """
+        Push plain text to the current component.
         """
-        Push plain text to the current component, preamble, or suffix.
+        nonlocal line_inside_parameter, char_inside_parameter
 
-        Also checks for stray text during strict parsing.
+        components[-1].append(text)
+        char_inside_parameter += len(text)
+        # TODO: decide how / whether to handle '\r'
+        # Most text has no line breaks; the `in` check stops at the first
+        # match, whereas counting always scans the whole string
+        if "\n" in text:
+            line_inside_parameter += text.count("\n")
+
+    def push_outside_text(text: str) -> None:
         """
-        nonlocal components, line_inside_parameter, char_inside_parameter, last_key
+        Push plain text to the preamble or suffix.
 
-        if inside_parameter:
-            components[-1].write(text)
-            char_inside_parameter += len(text)
-            # TODO: decide how / whether to handle '\r'
-            line_inside_parameter += value.count("\n")
-        else:
-            # Check for stray text during strict parsing
-            if text and strict and not text.isspace() and text != "\ufeff":
-                char = text.lstrip()[0]
+        Also checks for stray text during strict parsing.
+        """
+        # Check for stray text during strict parsing
+        if (
+            strict
+            and text
+            # Only hash single characters; longer text pays for one scan
+            and not (len(text) == 1 and text in _WHITESPACE_OR_BOM)
+            and not text.isspace()
+        ):
+            # Report the first character that isn't whitespace or a BOM;
+            # text made up of only those isn't stray
+            char = next((c for c in text if c != "\ufeff" and not c.isspace()), None)
+            if char is not None:
                 if last_key is None:
                     at_location = "at start of document"
                 else:
                     at_location = f"after {repr(last_key)} parameter"
                 raise MSDParserError(f"stray {repr(char)} encountered {at_location}")
 
-            if preamble and len(components) == 0:
-                preamble.write(text)
-            else:
-                suffix.write(text)
+        if preamble is not None and not components:
+            preamble.append(text)
+        else:
+            suffix.append(text)
 
     def next_component() -> None:
         """Append an empty component string"""
-        nonlocal inside_parameter, char_inside_parameter
-        inside_parameter = True
-        components.append(StringIO())
+        nonlocal char_inside_parameter
+        components.append([])
         char_inside_parameter += 1
 
     def assemble_parameter(reset: bool = False) -> Iterator[MSDParameter]:
         """
         Yield an MSDParameter from the current parser state.
         """
-        nonlocal preamble, components, inside_parameter, line_inside_parameter, char_inside_parameter, suffix, comments
+        nonlocal preamble, components, line_inside_parameter, char_inside_parameter, suffix, comments
 
         if len(components) == 0:
             return
 
+        key, *values = (_join_fragments(component) for component in components)
+        suffix_text = _join_fragments(suffix)
+
+        # Arguments are passed positionally (in field order: components,
+        # preamble, comments, escape_positions, suffix), which makes the
+        # dataclass constructor noticeably cheaper than keyword arguments
         yield MSDParameter(
-            components=tuple(component.getvalue() for component in components),
-            preamble=preamble and preamble.getvalue(),
-            comments=tuple(comments.items()),
-            escape_positions=tuple(escape_positions) if escapes else None,
-            suffix=suffix.getvalue(),
+            (_intern_key(key), *values),
+            None if preamble is None else "".join(preamble),
+            tuple(comments),
+            tuple(escape_positions) if escapes else None,
+            _COMMON_SUFFIXES.get(suffix_text, suffix_text),
         )
 
     def reset_state():
         """
         Reset the parser state to prepare it for the next parameter.
         """
-        nonlocal preamble, components, inside_parameter, line_inside_parameter, char_inside_parameter, suffix, comments, escape_positions
+        nonlocal preamble, components, line_inside_parameter, char_inside_parameter, suffix, comments, escape_positions
 
-        if preamble:
-            preamble = None
+        preamble = None
         components = []
-        inside_parameter = True
         line_inside_parameter = 0
         char_inside_parameter = 0
-        comments = {}
+        comments = []
         escape_positions = []
-        suffix = StringIO()
-
-    if tokens is None:
-        tokens = lex_msd(
-            file=file,
-            string=string,
-            escapes=escapes,
-        )
+        suffix = []
+
+    # Bind the token types to locals, which are cheaper to load than globals
+    # in the if/elif chain below. The chain itself is kept over a dispatch
+    # table: a few identity checks cost less than a handler call per token,
+    # and handlers couldn't yield parameters from inside this generator.
+    TEXT = _TEXT
+    START_PARAMETER = _START_PARAMETER
+    END_PARAMETER = _END_PARAMETER
+    NEXT_COMPONENT = _NEXT_COMPONENT
+    COMMENT = _COMMENT
+    ESCAPE = _ESCAPE
 
     for token, value in tokens:
-        if token is MSDToken.TEXT:
-            try:
-                push_text(value)
-            except MSDParserError:
-                if components:
-                    yield from assemble_parameter()
-                raise
-
-        elif token is MSDToken.START_PARAMETER:
+        if token is TEXT:
+            if inside_parameter:
+                push_component_text(value)
+            else:
+                try:
+                    push_outside_text(value)
+                except MSDParserError:
+                    if components:
+                        yield from assemble_parameter()
+                    raise
+
+        elif token is START_PARAMETER:
             assert not inside_parameter
             if len(components) > 0:
                 yield from assemble_parameter()
                 reset_state()
+            inside_parameter = True
             next_component()
 
-        elif token is MSDToken.END_PARAMETER:
+        elif token is END_PARAMETER:
             assert inside_parameter
             inside_parameter = False
-            last_key = components[0].getvalue()
-            suffix.write(value)
+            suffix.append(value)
 
-            if value != ";" and strict:
-                raise MSDParserError(
-                    f"Missing semicolon detected after {repr(last_key)} parameter"
-                )
+            if strict:
+                # The key is only needed for strict-mode error messages
+                last_key = _join_fragments(components[0])
+                if value != ";":
+                    raise MSDParserError(
+                        f"Missing semicolon detected after {repr(last_key)} parameter"
+                    )
 
-        elif token is MSDToken.NEXT_COMPONENT:
+        elif token is NEXT_COMPONENT:
             assert inside_parameter
             next_component()
 
-        elif token is MSDToken.ESCAPE:
-            try:
-                if inside_parameter:
-                    escape_positions.append(char_inside_parameter)
-                    # Account for the `\` itself
-                    char_inside_parameter += 1
-                push_text(value[1])
-            except MSDParserError:
-                if components:
-                    yield from assemble_parameter()
-                raise
-
-        elif token is MSDToken.COMMENT:
+        elif token is COMMENT:
             if inside_parameter:
-                comments[line_inside_parameter] = value
+                if comments and comments[-1][0] == line_inside_parameter:
+                    comments[-1] = (line_inside_parameter, value)
+                else:
+                    comments.append((line_inside_parameter, value))
                 char_inside_parameter += len(value)
             else:
-                if preamble and len(components) == 0:
-                    preamble.write(value)
+                if preamble is not None and not components:
+                    preamble.append(value)
                 else:
-                    suffix.write(value)
+                    suffix.append(value)
+
+        # Checked last: the lexer never emits escapes when `escapes` is False,
+        # so only malformed tokens fall through this far in that case
+        elif token is ESCAPE:
+            if inside_parameter:
+                escape_positions.append(char_inside_parameter)
+                # Push the escaped character inline rather than through
+                # push_component_text, accounting for the `\` itself
+                escaped = value[1]
+                components[-1].append(escaped)
+                char_inside_parameter += 2
+                if escaped == "\n":
+                    line_inside_parameter += 1
+            else:
+                try:
+                    push_outside_text(value[1])
+                except MSDParserError:
+                    if components:
+                        yield from assemble_parameter()
+                    raise
         else:
             assert False, f"unexpected token {token}"
 
     # Remember to output the last parameter
     yield from assemble_parameter()
+
+
+def _parse_path(
+    path: _PathType, *, encoding: str, escapes: bool, strict: bool
+) -> Tuple[_PathType, List[MSDParameter]]:
+    with open(path, "r", encoding=encoding) as file:
+        return path, list(parse_msd(file=file, escapes=escapes, strict=strict))
+
+
+def parse_msd_many(
+    paths: Iterable[_PathType],
+    *,
+    encoding: str = "utf-8",
+    escapes: bool = True,
+    strict: bool = False,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+) -> Iterator[Tuple[_PathType, List[MSDParameter]]]:
+    """
+    Parse many MSD files in parallel worker processes.
+
+    Yields a (path, list of :class:`.MSDParameter`) tuple for each of the
+    `paths`, in the same order. Set `ordered` to False to yield each file
+    as soon as it's parsed instead, which avoids waiting on a slow file
+    that comes early in `paths`. Each file is opened with the given
+    `encoding`; `escapes` and `strict` are passed through to
+    :func:`parse_msd`.
+
+    `workers` is the maximum number of processes (defaulting to the number
+    of CPUs), and `chunksize` is how many paths are sent to a worker at
+    once (only when `ordered` is True). Any exception raised while reading
+    or parsing a file is re-raised in place of that file's result: at its
+    position in `paths` when `ordered` is True, or as soon as that file
+    finishes when `ordered` is False. Either way, files that haven't
+    started parsing yet are cancelled when an exception is raised or the
+    generator is closed early.
+    """
+    parse_path = partial(_parse_path, encoding=encoding, escapes=escapes, strict=strict)
+    # Imported here because concurrent.futures (and the multiprocessing
+    # machinery behind it) is slow to import and rarely needed
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            yield from executor.map(parse_path, paths, chunksize=chunksize)
+        else:
+            futures = [executor.submit(parse_path, path) for path in paths]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # If the caller stops early or a file raises, cancel the
+                # files that haven't started yet; otherwise the executor
+                # would parse all of them before shutting down
+                for future in futures:
+                    future.cancel()
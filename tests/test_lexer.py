@@ -1,3 +1,4 @@
+from io import StringIO
 import unittest
 
 from msdparser.lexer import MSDToken, lex_msd
@@ -109,3 +110,30 @@ class TestLexMSD(unittest.TestCase):
         self.assertEqual((MSDToken.END_PARAMETER, ";"), next(lex))
         self.assertEqual((MSDToken.COMMENT, "//#NO:PE;"), next(lex))
         self.assertRaises(StopIteration, next, lex)
+
+    def test_input_spanning_multiple_reads(self):
+        data = "".join(f"#KEY{i}:value {i}// comment\n;\n" for i in range(10000))
+        tokens = list(lex_msd(file=StringIO(data)))
+
+        self.assertEqual(data, "".join(text for _, text in tokens))
+        self.assertEqual(
+            10000, sum(token is MSDToken.START_PARAMETER for token, _ in tokens)
+        )
+        self.assertEqual(10000, sum(token is MSDToken.COMMENT for token, _ in tokens))
+
+    def test_slashes_in_text(self):
+        lex = lex_msd(string="#BANNER:Songs/Pack/bn.png;#A:1/2//3/\n;")
+
+        self.assertEqual((MSDToken.START_PARAMETER, "#"), next(lex))
+        self.assertEqual((MSDToken.TEXT, "BANNER"), next(lex))
+        self.assertEqual((MSDToken.NEXT_COMPONENT, ":"), next(lex))
+        self.assertEqual((MSDToken.TEXT, "Songs/Pack/bn.png"), next(lex))
+        self.assertEqual((MSDToken.END_PARAMETER, ";"), next(lex))
+        self.assertEqual((MSDToken.START_PARAMETER, "#"), next(lex))
+        self.assertEqual((MSDToken.TEXT, "A"), next(lex))
+        self.assertEqual((MSDToken.NEXT_COMPONENT, ":"), next(lex))
+        self.assertEqual((MSDToken.TEXT, "1/2"), next(lex))
+        self.assertEqual((MSDToken.COMMENT, "//3/"), next(lex))
+        self.assertEqual((MSDToken.TEXT, "\n"), next(lex))
+        self.assertEqual((MSDToken.END_PARAMETER, ";"), next(lex))
+        self.assertRaises(StopIteration, next, lex)
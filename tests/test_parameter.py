@@ -4,6 +4,83 @@ from msdparser.parameter import MSDParameter
 from msdparser.parser import parse_msd
 
 
+# (name, components, preamble, comments, escape_positions, suffix, expected)
+STRINGIFY_EXACT_CASES = (
+    (
+        "no comments or escapes",
+        ("key", "value"),
+        "// Copyright 2024\n\n",
+        (),
+        (),
+        ";\n",
+        "// Copyright 2024\n\n#key:value;\n",
+    ),
+    (
+        "newline ending",
+        ("key", "value \nline two\nline 3\n"),
+        "// Copyright 2024\n\n",
+        ((0, "// comment"),),
+        (),
+        ";\n",
+        "// Copyright 2024\n\n#key:value // comment\nline two\nline 3\n;\n",
+    ),
+    (
+        "comment ending",
+        ("key", "value \nline two\nline 3 \n"),
+        "// Copyright 2024\n\n",
+        ((0, "// comment"), (2, "// another comment")),
+        (),
+        ";\n",
+        "// Copyright 2024\n\n#key:value // comment\nline two\nline 3 // another comment\n;\n",
+    ),
+    (
+        "text ending",
+        ("key", "value \nline two\nline 3"),
+        "// Copyright 2024\n\n",
+        ((0, "// comment"),),
+        (),
+        ";\n",
+        "// Copyright 2024\n\n#key:value // comment\nline two\nline 3;\n",
+    ),
+    (
+        "text ending and middle comment",
+        ("key", "value\nline two \nline 3"),
+        "// Copyright 2024\n\n",
+        ((1, "// comment"),),
+        (),
+        ";\n",
+        "// Copyright 2024\n\n#key:value\nline two // comment\nline 3;\n",
+    ),
+    (
+        "text ending and middle comment and windows newlines",
+        ("key", "value\r\n, \r\nline 3"),
+        "// Copyright 2024\r\n\r\n",
+        ((1, "// comment"),),
+        (),
+        ";\r\n",
+        "// Copyright 2024\r\n\r\n#key:value\r\n, // comment\r\nline 3;\r\n",
+    ),
+    (
+        "newline ending and escapes",
+        ("key", "value: \nline two;\nline//3\n"),
+        "// Copyright 2024\n\n",
+        ((0, "// comment //"),),
+        (10, 35, 42),
+        ";\n",
+        "// Copyright 2024\n\n#key:value\\: // comment //\nline two\\;\nline\\//3\n;\n",
+    ),
+    (
+        "unnecessary escape",
+        ("key", "value"),
+        "",
+        (),
+        (5,),
+        ";\n",
+        "#key:\\value;\n",
+    ),
+)
+
+
 class TestMSDParameter(unittest.TestCase):
     def test_constructor(self):
         param = MSDParameter(("key", "value"))
@@ -12,6 +89,7 @@ class TestMSDParameter(unittest.TestCase):
         self.assertEqual("value", param.value)
         self.assertIs(param.components[0], param.key)
         self.assertIs(param.components[1], param.value)
+        self.assertFalse(hasattr(param, "__dict__"))
 
     def test_key_without_value(self):
         param = MSDParameter(("key",))
@@ -52,112 +130,49 @@ class TestMSDParameter(unittest.TestCase):
         )
 
         for invalid_param in invalid_params:
-            self.assertRaises(ValueError, invalid_param.stringify, escapes=False)
+            with self.subTest(components=invalid_param.components):
+                self.assertRaises(ValueError, invalid_param.stringify, escapes=False)
 
-    def test_stringify_with_literal_pound_sign(self):
-        param = MSDParameter(("key", "#value"))
-        self.assertEqual("#key:#value;", param.stringify(escapes=False))
-        self.assertEqual("#key:\\#value;", param.stringify(escapes=True))
+    def test_special_substrings_are_detected(self):
+        for substring in MSDParameter._SHOULD_ESCAPE + MSDParameter._MUST_ESCAPE:
+            with self.subTest(substring=substring):
+                param = MSDParameter(("key", f"a{substring}b"))
 
-    def test_stringify_with_exact_and_newline_ending(self):
-        param = MSDParameter(
-            ("key", "value \nline two\nline 3\n"),
-            preamble="// Copyright 2024\n\n",
-            comments=((0, "// comment"),),
-            escape_positions=(),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\n\n#key:value // comment\nline two\nline 3\n;\n",
-            result,
-        )
+                self.assertEqual(f"#key:a\\{substring}b;", str(param))
 
-        self.assertEqual(param, next(parse_msd(string=result)))
+        for substring in MSDParameter._MUST_ESCAPE:
+            with self.subTest(substring=substring, escapes=False):
+                param = MSDParameter(("key", f"a{substring}b"))
 
-    def test_stringify_with_exact_and_comment_ending(self):
-        param = MSDParameter(
-            ("key", "value \nline two\nline 3 \n"),
-            preamble="// Copyright 2024\n\n",
-            comments=((0, "// comment"), (2, "// another comment")),
-            escape_positions=(),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\n\n#key:value // comment\nline two\nline 3 // another comment\n;\n",
-            result,
-        )
+                self.assertRaises(ValueError, param.stringify, escapes=False)
 
-        self.assertEqual(param, next(parse_msd(string=result)))
-
-    def test_stringify_with_exact_and_text_ending(self):
-        param = MSDParameter(
-            ("key", "value \nline two\nline 3"),
-            preamble="// Copyright 2024\n\n",
-            comments=((0, "// comment"),),
-            escape_positions=(),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\n\n#key:value // comment\nline two\nline 3;\n",
-            result,
-        )
-
-        self.assertEqual(param, next(parse_msd(string=result)))
-
-    def test_stringify_with_exact_and_text_ending_and_middle_comment(
-        self,
-    ):
-        param = MSDParameter(
-            ("key", "value\nline two \nline 3"),
-            preamble="// Copyright 2024\n\n",
-            comments=((1, "// comment"),),
-            escape_positions=(),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\n\n#key:value\nline two // comment\nline 3;\n",
-            result,
-        )
-
-        self.assertEqual(param, next(parse_msd(string=result)))
-
-    def test_stringify_with_exact_and_text_ending_and_middle_comment_and_windows_newlines(
-        self,
-    ):
-        param = MSDParameter(
-            ("key", "value\r\n, \r\nline 3"),
-            preamble="// Copyright 2024\r\n\r\n",
-            comments=((1, "// comment"),),
-            escape_positions=(),
-            suffix=";\r\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\r\n\r\n#key:value\r\n, // comment\r\nline 3;\r\n",
-            result,
-        )
-
-        self.assertEqual(param, next(parse_msd(string=result)))
-
-    def test_stringify_with_exact_and_newline_ending_and_escapes(self):
-        param = MSDParameter(
-            ("key", "value: \nline two;\nline//3\n"),
-            preamble="// Copyright 2024\n\n",
-            comments=((0, "// comment //"),),
-            escape_positions=(10, 35, 42),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "// Copyright 2024\n\n#key:value\\: // comment //\nline two\\;\nline\\//3\n;\n",
-            result,
-        )
+    def test_stringify_with_literal_pound_sign(self):
+        param = MSDParameter(("key", "#value"))
+        self.assertEqual("#key:#value;", param.stringify(escapes=False))
+        self.assertEqual("#key:\\#value;", param.stringify(escapes=True))
 
-        self.assertEqual(param, next(parse_msd(string=result)))
+    def test_stringify_with_exact(self):
+        for (
+            name,
+            components,
+            preamble,
+            comments,
+            escape_positions,
+            suffix,
+            expected,
+        ) in STRINGIFY_EXACT_CASES:
+            with self.subTest(case=name):
+                param = MSDParameter(
+                    components,
+                    preamble=preamble,
+                    comments=comments,
+                    escape_positions=escape_positions,
+                    suffix=suffix,
+                )
+                result = param.stringify(exact=True)
+                self.assertEqual(expected, result)
+
+                self.assertEqual(param, next(parse_msd(string=result)))
 
     def test_stringify_with_exact_and_newline_ending_and_escapes_disabled(self):
         param = MSDParameter(
@@ -168,19 +183,3 @@ class TestMSDParameter(unittest.TestCase):
             suffix=";\n",
         )
         self.assertRaises(ValueError, param.stringify, exact=True, escapes=False)
-
-    def test_stringify_with_exact_and_unnecessary_escape(self):
-        param = MSDParameter(
-            ("key", "value"),
-            preamble="",
-            comments=(),
-            escape_positions=(5,),
-            suffix=";\n",
-        )
-        result = param.stringify(exact=True)
-        self.assertEqual(
-            "#key:\\value;\n",
-            result,
-        )
-
-        self.assertEqual(param, next(parse_msd(string=result)))
@@ -1,19 +1,29 @@
 import codecs
 from io import StringIO
+import time
 import unittest
 from msdparser.parameter import MSDParameter
-from msdparser.parser import MSDParserError, parse_msd
+from msdparser.parser import MSDParserError, parse_msd, parse_msd_many
 
 
 class TestParseMSD(unittest.TestCase):
+    _SENTINEL = object()
+
+    def _assertExhausted(self, parse):
+        self.assertIs(self._SENTINEL, next(parse, self._SENTINEL))
+
     def test_file_and_string_args(self):
         data = "#A:B;"
         from_file = parse_msd(file=StringIO(data))
         from_string = parse_msd(string=data)
 
         self.assertEqual(next(from_file), next(from_string))
-        self.assertRaises(StopIteration, next, from_file)
-        self.assertRaises(StopIteration, next, from_string)
+        self._assertExhausted(from_file)
+        self._assertExhausted(from_string)
+
+    def test_invalid_args(self):
+        self.assertRaises(TypeError, parse_msd)
+        self.assertRaises(TypeError, parse_msd, file=StringIO("#A:B;"), string="#A:B;")
 
     def test_real_file_args(self):
         testdata = [
@@ -38,10 +48,15 @@ class TestParseMSD(unittest.TestCase):
 
                 self.assertEqual(string_copy, joined_parameters)
 
+    def test_keys_are_interned(self):
+        first, second = parse_msd(string="#TITLE:A;#TITLE:B;")
+
+        self.assertIs(first.key, second.key)
+
     def test_empty(self):
         parse = parse_msd(string="")
 
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_normal_characters(self):
         parse = parse_msd(
@@ -57,7 +72,7 @@ class TestParseMSD(unittest.TestCase):
             ),
             param.components,
         )
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_preamble(self):
         parse = parse_msd(string="// Copyright (c) Ash Garcia 2024\n#TITLE:asdf;")
@@ -87,7 +102,13 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("G", "H"), parameter.components)
         self.assertEqual(";// test\n", parameter.suffix)
 
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
+
+    def test_common_suffixes_are_shared(self):
+        first, second = parse_msd(string="#A:B;\n#C:D;\n")
+
+        self.assertEqual(";\n", first.suffix)
+        self.assertIs(first.suffix, second.suffix)
 
     def test_comments(self):
         parse = parse_msd(string="#A// comment //\r\nBC:D// ; \nEF;//#NO:PE;")
@@ -95,7 +116,15 @@ class TestParseMSD(unittest.TestCase):
         parameter = next(parse)
         self.assertEqual(("A\r\nBC", "D\nEF"), parameter.components)
         self.assertEqual(((0, "// comment //"), (1, "// ; ")), parameter.comments)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
+
+    def test_comments_separated_by_carriage_return(self):
+        parse = parse_msd(string="#A:B//x\r//y\n;")
+
+        parameter = next(parse)
+        self.assertEqual(("A", "B\r\n"), parameter.components)
+        self.assertEqual(((0, "//y"),), parameter.comments)
+        self._assertExhausted(parse)
 
     def test_comment_with_no_newline_at_eof(self):
         parse = parse_msd(string="#ABC:DEF// eof")
@@ -104,7 +133,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("ABC", "DEF"), parameter.components)
         self.assertEqual(((0, "// eof"),), parameter.comments)
         self.assertEqual("", parameter.suffix)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_empty_key(self):
         parse = parse_msd(string="#:ABC;#:DEF;")
@@ -113,7 +142,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("", "ABC"), parameter.components)
         parameter = next(parse)
         self.assertEqual(("", "DEF"), parameter.components)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_empty_value(self):
         parse = parse_msd(string="#ABC:;#DEF:;")
@@ -122,7 +151,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("ABC", ""), parameter.components)
         parameter = next(parse)
         self.assertEqual(("DEF", ""), parameter.components)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_missing_value(self):
         parse = parse_msd(string="#ABC;#DEF;")
@@ -133,7 +162,7 @@ class TestParseMSD(unittest.TestCase):
         parameter = next(parse)
         self.assertEqual(("DEF",), parameter.components)
         self.assertEqual("", parameter.value)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_missing_semicolon(self):
         parse = parse_msd(string="#A:B\nCD;#E:FGH\n#IJKL // comment\n#M:NOP")
@@ -146,7 +175,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("IJKL ",), parameter.components)
         parameter = next(parse)
         self.assertEqual(("M", "NOP"), parameter.components)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_missing_value_and_semicolon(self):
         parse = parse_msd(string="#A\n#B\n\n#C")
@@ -160,7 +189,7 @@ class TestParseMSD(unittest.TestCase):
         parameter = next(parse)
         self.assertEqual(("C",), parameter.components)
         self.assertEqual("", parameter.suffix)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_unicode(self):
         parse = parse_msd(string="#TITLE:実例;\n#ARTIST:楽士;")
@@ -169,7 +198,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("TITLE", "実例"), parameter.components)
         parameter = next(parse)
         self.assertEqual(("ARTIST", "楽士"), parameter.components)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_stray_text_with_strict_parsing(self):
         parse = parse_msd(string="#A:B;#C:D;n#E:F;", strict=True)
@@ -209,6 +238,25 @@ class TestParseMSD(unittest.TestCase):
             parse,
         )
 
+    def test_whitespace_and_bom_with_strict_parsing(self):
+        parse = parse_msd(string="\ufeff#A:B;\n#C:D;\t\r\n #E:F;", strict=True)
+
+        self.assertEqual(["A", "C", "E"], [param.key for param in parse])
+
+        parse = parse_msd(string="\ufeff\n#A:B;", strict=True)
+
+        self.assertEqual(["A"], [param.key for param in parse])
+
+    def test_stray_slash_after_bom_with_strict_parsing(self):
+        parse = parse_msd(string="\ufeff/#A:B;", strict=True)
+
+        self.assertRaisesRegex(
+            MSDParserError,
+            "stray '/' encountered at start of document",
+            next,
+            parse,
+        )
+
     def test_stray_semicolon_with_strict_parsing(self):
         parse = parse_msd(string="#A:B;#C:D;;#E:F;", strict=True)
 
@@ -232,7 +280,7 @@ class TestParseMSD(unittest.TestCase):
         parameter = next(parse)
         self.assertEqual(("C", "D"), parameter.components)
         self.assertEqual(";", parameter.suffix)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_escapes(self):
         parse = parse_msd(string="#A\\:B:C\\;D;#EF\\#:G\\\\H;#LF:\\\nLF;")
@@ -246,7 +294,7 @@ class TestParseMSD(unittest.TestCase):
         parameter = next(parse)
         self.assertEqual(("LF", "\nLF"), parameter.components)
         self.assertEqual((4,), parameter.escape_positions)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_no_escapes(self):
         parse = parse_msd(
@@ -260,7 +308,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual(("E\\#F", "G\\\\H"), parameter.components)
         parameter = next(parse)
         self.assertEqual(("LF", "\\\nLF"), parameter.components)
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_preamble_and_comment_and_escapes(self):
         parse = parse_msd(
@@ -275,7 +323,7 @@ class TestParseMSD(unittest.TestCase):
         self.assertEqual((10, 35, 42), parameter.escape_positions)
         self.assertEqual(";\n", parameter.suffix)
 
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
 
     def test_preamble_and_comment_and_escapes_disabled(self):
         parse = parse_msd(
@@ -290,4 +338,61 @@ class TestParseMSD(unittest.TestCase):
         self.assertIsNone(parameter.escape_positions)
         self.assertEqual(";\nline\\//3\n;\n", parameter.suffix)
 
-        self.assertRaises(StopIteration, next, parse)
+        self._assertExhausted(parse)
+
+
+class TestParseMSDMany(unittest.TestCase):
+    def test_parse_msd_many(self):
+        testdata = [
+            "tests/testdata/#Fairy_dancing_in_lake.sm",
+            "tests/testdata/backup.sm",
+            "tests/testdata/backup.ssc",
+        ]
+        results = list(parse_msd_many(testdata, workers=2, chunksize=1))
+
+        self.assertEqual(testdata, [path for path, _ in results])
+        for path, parameters in results:
+            with self.subTest(testfile=path):
+                with codecs.open(path, encoding="utf-8") as infile:
+                    self.assertEqual(list(parse_msd(file=infile)), parameters)
+
+    def test_parse_msd_many_unordered(self):
+        testdata = [
+            "tests/testdata/#Fairy_dancing_in_lake.sm",
+            "tests/testdata/backup.sm",
+            "tests/testdata/backup.ssc",
+        ]
+        results = dict(parse_msd_many(testdata, workers=2, ordered=False))
+
+        self.assertEqual(set(testdata), set(results))
+        for path, parameters in results.items():
+            with self.subTest(testfile=path):
+                with codecs.open(path, encoding="utf-8") as infile:
+                    self.assertEqual(list(parse_msd(file=infile)), parameters)
+
+    def test_parse_msd_many_reraises_errors(self):
+        parse = parse_msd_many(["tests/testdata/missing.sm"], workers=1)
+
+        self.assertRaises(FileNotFoundError, list, parse)
+
+    def test_parse_msd_many_unordered_stops_early(self):
+        paths = ["tests/testdata/backup.sm"] * 200
+
+        start = time.perf_counter()
+        list(parse_msd_many(paths, workers=2, ordered=False))
+        parse_all_time = time.perf_counter() - start
+
+        # Closing the generator early shouldn't wait on the remaining files
+        start = time.perf_counter()
+        parse = parse_msd_many(paths, workers=2, ordered=False)
+        next(parse)
+        parse.close()
+        self.assertLess(time.perf_counter() - start, parse_all_time / 2)
+
+        # Neither should an error from the first file
+        start = time.perf_counter()
+        parse = parse_msd_many(
+            ["tests/testdata/missing.sm", *paths], workers=2, ordered=False
+        )
+        self.assertRaises(FileNotFoundError, list, parse)
+        self.assertLess(time.perf_counter() - start, parse_all_time / 2)